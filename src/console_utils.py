@@ -10,9 +10,10 @@ Código sob licença MIT. Consultar: https://mit-license.org/
 
 import sys
 import os
+import shutil
 import subprocess as subproc
 from collections.abc import Mapping
-from typing import Iterable, Any
+from typing import Iterable, Any, NamedTuple
 from contextlib import contextmanager
 
 
@@ -24,10 +25,17 @@ __all__ = (
     'ask',
     'show_msg',
     'show_msgs',
+    'format_msg',
     'show_table',
     'pause',
     'clear_screen',
     'supports_ansi_terminal',
+    'supports_char_insertion',
+    'Style',
+    'colors_requested',
+    'colors_enabled',
+    'sgr',
+    'styled_text',
     'set_global_indentation',
     'temp_indentation',
 )
@@ -219,6 +227,15 @@ def show_msgs(msgs: Iterable[str], *args, indent: int | None = None, **kargs):
         show_msg(msg, *args, indent = indent, **kargs)
 #:
 
+def format_msg(msg: str, indent: int | None = None) -> str:
+    """
+    Return `msg` indented just like `show_msg(msg)` would display it,
+    but without the line terminator.
+    """
+    indent = _indentation if indent is None else indent
+    return f"{' ' * indent}{msg}"
+#:
+
 def show_table(
         elements: Iterable, 
         col_defs: dict[str, dict], 
@@ -379,6 +396,140 @@ def supports_ansi_terminal() -> bool:
     return supported
 #:
 
+def supports_char_insertion(line_width: int) -> bool:
+    """
+    Return True if a line with `line_width` characters (plus the
+    current indentation) can be shifted in place with the ICH (insert
+    character) and EL (erase in line) ANSI sequences. This requires an
+    ANSI terminal, other than a 'dumb' one, wide enough for the line
+    not to wrap.
+    """
+    return (
+        supports_ansi_terminal()
+        and os.getenv('TERM') != 'dumb'
+        and shutil.get_terminal_size().columns > _indentation + line_width
+    )
+#:
+
+class Style(NamedTuple):
+    """
+    Display attributes of a single cell. `fg` and `bg` are SGR colour
+    codes (eg, 31 for red foreground, 44 for blue background, 90-97
+    for bright foregrounds). `None` means the terminal's default.
+    """
+    fg: int | None = None
+    bg: int | None = None
+    bold: bool = False
+    reverse: bool = False
+#:
+
+DEFAULT_STYLE = Style()
+
+_SGR_RESET = '\x1b[0m'
+_sgr_cache: dict[tuple[Style | None, Style], str] = {}
+
+
+def colors_requested() -> bool:
+    """
+    Return False if the user asked for no colours by setting `NO_COLOR`
+    to a non-empty value (see https://no-color.org/). Unlike
+    `colors_enabled`, this doesn't look at stdout, so it also applies
+    to output sent elsewhere (eg, to a socket).
+    """
+    return not os.environ.get('NO_COLOR')
+#:
+
+def colors_enabled() -> bool:
+    """
+    Return True if styled output should be emitted to stdout: the
+    terminal must understand ANSI codes and colours must have been
+    requested (see `colors_requested`).
+    """
+    return supports_ansi_terminal() and colors_requested()
+#:
+
+def sgr(style: Style, prev_style: Style | None = None) -> str:
+    """
+    Return the shortest SGR escape sequence that takes the terminal
+    from `prev_style` to `style`: only the attributes that change are
+    sent. With `prev_style` set to `None` (ie, unknown state), the
+    sequence starts with a reset and sets every attribute of `style`.
+    Results are cached.
+
+    >>> sgr(Style(fg = 33, bold = True)) == '\x1b[0;1;33m'
+    True
+    >>> sgr(Style(fg = 33, bold = True), Style(fg = 31, bold = True)) == '\x1b[33m'
+    True
+    >>> sgr(Style(), Style(fg = 33, bold = True)) == '\x1b[0m'
+    True
+    """
+    key = (prev_style, style)
+    seq = _sgr_cache.get(key)
+    if seq is None:
+        if style == DEFAULT_STYLE:
+            params = ['0']
+        elif prev_style is None:
+            params = ['0', *_sgr_params(style, DEFAULT_STYLE)]
+        else:
+            params = _sgr_params(style, prev_style)
+        seq = _sgr_cache[key] = f"\x1b[{';'.join(params)}m"
+    return seq
+#:
+
+def _sgr_params(style: Style, prev_style: Style) -> list[str]:
+    params = []
+    if style.bold != prev_style.bold:
+        params.append('1' if style.bold else '22')
+    if style.reverse != prev_style.reverse:
+        params.append('7' if style.reverse else '27')
+    if style.fg != prev_style.fg:
+        params.append('39' if style.fg is None else str(style.fg))
+    if style.bg != prev_style.bg:
+        params.append('49' if style.bg is None else str(style.bg))
+    return params
+#:
+
+def styled_text(
+        text: Iterable[str],
+        styles: Iterable[Style | None],
+        enabled: bool | None = None,
+) -> str:
+    """
+    Join the characters in `text`, each one displayed with the
+    corresponding style in `styles` (`None` means `DEFAULT_STYLE`).
+    An escape sequence is only emitted when the style changes from one
+    character to the next, so a run of equally styled characters costs
+    a single sequence, and that sequence only changes the attributes
+    that differ from the previous style. The terminal is assumed to be
+    in the default style at the start and, if the text ends with a
+    non-default style, it is reset at the end.
+
+    With `enabled` set to `None`, styles are only applied if
+    `colors_enabled()` returns True. Otherwise, the plain text is
+    returned.
+
+    >>> styled_text('ab.', [Style(fg = 31), Style(fg = 31), None],
+    ...             enabled = True) == '\x1b[31mab\x1b[0m.'
+    True
+    """
+    if enabled is None:
+        enabled = colors_enabled()
+    if not enabled:
+        return ''.join(text)
+
+    parts = []
+    curr_style = DEFAULT_STYLE
+    for ch, style in zip(text, styles):
+        style = style or DEFAULT_STYLE
+        if style != curr_style:
+            parts.append(sgr(style, curr_style))
+            curr_style = style
+        parts.append(ch)
+    if curr_style != DEFAULT_STYLE:
+        parts.append(_SGR_RESET)
+    return ''.join(parts)
+#:
+
 #
 # def clear_screen():
 #     if os.name == 'posix':
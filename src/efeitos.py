@@ -50,17 +50,28 @@ Código sob licença MIT. Consultar: https://mit-license.org/
 
 import sys
 import time
-import random
 import argparse
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Iterator
 
-from console_utils import clear_screen, pause, show_msg, show_msgs, ask
-from utils import renumerate
+from console_utils import (
+    clear_screen,
+    pause,
+    show_msg,
+    show_msgs,
+    ask,
+    Style,
+    styled_text,
+    supports_char_insertion,
+)
+from utils import renumerate, random_permutation, MappedTextFile
 
 
 DEFAULT_LINE_LEN = 40     # em caracteres
 DEFAULT_DELAY = 0.1       # em segundos (neste caso temos 0.1s)
 
+TEXT_STYLE = Style(fg = 33, bold = True)      # texto sobre o fundo de '.'
+NEW_CELL_STYLE = Style(fg = 30, bg = 43)      # posição acabada de destapar
+
 
 def main():
     # 
@@ -82,6 +93,13 @@ def main():
         default = DEFAULT_LINE_LEN,
         metavar = 'DIMENSAO_LINHA',
     )
+    parser.add_argument(
+        '-s', '--seed', '--semente',
+        help = 'Semente para os efeitos aleatórios (torna a execução reprodutível)',
+        type = int,
+        default = None,
+        metavar = 'SEMENTE',
+    )
     parser.add_argument(
         'text',
         help = 'Palavras a listar',
@@ -116,9 +134,9 @@ def main():
             case '6':
                 show_slidding_effect(txt, delay = args.delay, line_len = args.line_len)
             case '7':
-                show_uncover_line_effect(txt, delay = args.delay, speedup = 0.5)
+                show_uncover_line_effect(txt, delay = args.delay, speedup = 0.5, seed = args.seed)
             case '8':
-                show_uncover_matrix_effect(txt, delay = args.delay, speedup = 2.0)
+                show_uncover_matrix_effect(txt, delay = args.delay, speedup = 2.0, seed = args.seed)
             case 'T' | 'TODOS':
                 show_all_effects(
                     txt,
@@ -129,8 +147,8 @@ def main():
                         show_v_effect,
                         show_stair_effect,
                         show_slidding_effect,
-                        lambda txt: show_uncover_line_effect(txt, delay = args.delay, speedup = 0.5),
-                        lambda txt: show_uncover_matrix_effect(txt, delay = args.delay, speedup = 2.0)
+                        lambda txt: show_uncover_line_effect(txt, delay = args.delay, speedup = 0.5, seed = args.seed),
+                        lambda txt: show_uncover_matrix_effect(txt, delay = args.delay, speedup = 2.0, seed = args.seed)
                     ),
                 )
                 continue
@@ -172,7 +190,7 @@ def show_left_to_right_diagonal_effect(txt: str):
         show_msg(f"{' ' * i}{ch}")
 #:
 
-def show_right_to_left_diagonal_effect(txt: str):
+def show_right_to_left_diagonal_effect(txt: str | MappedTextFile):
     for i, ch in renumerate(txt):
         show_msg(f"{' ' * i}{ch}")
 #:
@@ -188,7 +206,7 @@ def show_x_effect(txt: str):
         print()
 #:
 
-def show_v_effect(txt: str):
+def show_v_effect(txt: str | MappedTextFile):
     isc = len(txt) * 2 - 2      # inside_spaces_count
     osc = 0                     # outside_spaces_count
     for ch1, ch2 in zip(txt, reversed(txt)):
@@ -197,54 +215,168 @@ def show_v_effect(txt: str):
         osc += 1
 #:
 
-def show_stair_effect(txt: str):
-    words = reversed(txt.split())
+def show_stair_effect(txt: str | MappedTextFile):
+    if isinstance(txt, MappedTextFile):
+        words = txt.reversed_words()    # sem carregar o ficheiro todo
+    else:
+        words = reversed(txt.split())
     for i, word in enumerate(words):
         show_msg(f"{' ' * i}{word}")
 #:
 
 def show_slidding_effect(txt: str, line_len = DEFAULT_LINE_LEN, delay = DEFAULT_DELAY):
+    # Se o terminal o permitir, em cada passo desloca a linha com ICH e
+    # só escreve o carácter que dá a volta, em vez da linha inteira
+    if supports_char_insertion(line_len):
+        frames = slidding_deltas(txt, line_len)
+    else:
+        frames = slidding_frames(txt, line_len)
     try:
-        i = 0
-        while True:
-            line = ['.'] * line_len
-            for j, ch in enumerate(txt):
-                line[(i + j) % line_len] = ch
-            show_msg(f"{''.join(line)}", end = '\r')
+        for frame in frames:
+            show_msg(frame, end = '\r')
             time.sleep(delay)
-            i += 1
     except KeyboardInterrupt:
-        show_msg(''.join(line))  # type: ignore
+        print()
+#:
+
+def slidding_frames(
+        txt: str,
+        line_len = DEFAULT_LINE_LEN,
+        color: bool | None = None,
+) -> Iterator[str]:
+    i = 0
+    while True:
+        line, styles = _slidding_line(txt, line_len, i)
+        yield styled_text(line, styles, enabled = color)
+        i += 1
+#:
+
+def slidding_deltas(
+        txt: str,
+        line_len = DEFAULT_LINE_LEN,
+        color: bool | None = None,
+) -> Iterator[str]:
+    """
+    Like `slidding_frames`, but only the first frame has the whole
+    line. Each following frame must be written with the cursor at the
+    start of the line and:
+        1. inserts a blank there (ICH), shifting the line to the right;
+        2. writes the character that wrapped around over that blank;
+        3. moves past the end of the line and erases what was pushed
+           out of it (EL).
+    """
+    line, styles = _slidding_line(txt, line_len, 0)
+    yield styled_text(line, styles, enabled = color)
+    skip_line = f'\x1b[{line_len - 1}C' if line_len > 1 else ''  # 0C == 1C
+    i = 1
+    while True:
+        # a posição 0 da frame i tem o que estava em -i na frame 0
+        k = -i % line_len
+        ch = styled_text(line[k], [styles[k]], enabled = color)
+        yield f'\x1b[@{ch}{skip_line}\x1b[K'
+        i += 1
+#:
+
+def _slidding_line(
+        txt: str,
+        line_len: int,
+        offset: int,
+) -> tuple[list[str], list[Style | None]]:
+    line = ['.'] * line_len
+    styles: list[Style | None] = [None] * line_len
+    for j, ch in enumerate(txt):
+        line[(offset + j) % line_len] = ch
+        styles[(offset + j) % line_len] = TEXT_STYLE
+    return line, styles
 #:
 
-def show_uncover_line_effect(txt: str, delay = DEFAULT_DELAY, speedup = 1.0):
+def show_uncover_line_effect(
+        txt: str,
+        delay = DEFAULT_DELAY,
+        speedup = 1.0,
+        seed: int | None = None,
+):
     delay /= speedup
-    random_positions = list(range(len(txt)))
-    random.shuffle(random_positions)
+    for line in uncover_line_frames(txt, seed = seed):
+        show_msg(line, end = '\r')
+        time.sleep(delay)
+    print()
+#:
+
+def uncover_line_frames(
+        txt: str,
+        color: bool | None = None,
+        seed: int | None = None,
+) -> Iterator[str]:
+    random_positions = random_permutation(len(txt), seed)
     line = ['.'] * len(txt)
+    styles: list[Style | None] = [None] * len(txt)
     for pos in random_positions:
         line[pos] = txt[pos]
-        show_msg(''.join(line), end = '\r')
-        time.sleep(delay)
-    print()
+        styles[pos] = NEW_CELL_STYLE
+        yield styled_text(line, styles, enabled = color)
+        styles[pos] = None
+    yield ''.join(line)
 #:
 
-def show_uncover_matrix_effect(txt: str, delay = DEFAULT_DELAY, speedup = 1.0):
+def show_uncover_matrix_effect(
+        txt: str,
+        delay = DEFAULT_DELAY,
+        speedup = 1.0,
+        seed: int | None = None,
+):
     delay /= speedup
-    random_positions = list(range(len(txt) ** 2))
-    random.shuffle(random_positions)
-    matrix = [['.' for _ in range(len(txt))] for _ in range(len(txt))]
-
-    for pos in random_positions:
+    for lines in uncover_matrix_frames(txt, seed = seed):
         clear_screen()
-        l = pos // len(txt)
-        c = pos % len(txt)
-        matrix[l][c] = txt[c]
-        # print('\n'.join(''.join(line) for line in matrix))
-        show_msgs(''.join(line) for line in matrix)
+        show_msgs(lines)
         time.sleep(delay)
 #:
 
+def uncover_matrix_frames(
+        txt: str,
+        color: bool | None = None,
+        seed: int | None = None,
+) -> Iterator[list[str]]:
+    # gera as posições à medida que são precisas: nada de listas com
+    # len(txt) ** 2 inteiros
+    random_positions = random_permutation(len(txt) ** 2, seed)
+    # na coluna c só pode aparecer txt[c], logo basta saber quais as
+    # posições destapadas (um byte por posição)
+    n = len(txt)
+    uncovered = bytearray(n ** 2)
+    # cada frame só muda a linha da posição destapada e a linha onde
+    # estava a posição destacada na frame anterior: as outras linhas
+    # são reaproveitadas
+    lines = ['.' * n for _ in range(n)]
+
+    def render_line(l: int, highlight_col = -1) -> str:
+        line = ''.join(
+            txt[c] if uncovered[l * n + c] else '.' for c in range(n)
+        )
+        if highlight_col < 0:
+            return line
+        return styled_text(
+            (line[:highlight_col], line[highlight_col], line[highlight_col + 1:]),
+            (None, NEW_CELL_STYLE, None),
+            enabled = color,
+        )
+    #:
+
+    prev_l = -1
+    for pos in random_positions:
+        l = pos // n
+        c = pos % n
+        uncovered[pos] = 1
+        if prev_l not in (-1, l):
+            lines[prev_l] = render_line(prev_l)
+        lines[l] = render_line(l, c)
+        prev_l = l
+        yield lines.copy()
+    if prev_l != -1:
+        lines[prev_l] = render_line(prev_l)
+        yield lines.copy()
+#:
+
 def show_all_effects(
         txt: str, 
         effects: Iterable[Callable],
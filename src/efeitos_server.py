@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Servidor que exibe um dos efeitos de `efeitos.py` em vários terminais
+ao mesmo tempo (ecrãs de átrio, painéis do tmux, etc.). Cada frame do
+efeito é gerada e codificada uma única vez, e os bytes resultantes são
+depois enviados a todos os clientes ligados por TCP ou por sockets Unix.
+
+    $ efeitos_server.py [-e EFEITO] [-i INTERVALO] [-d DIM] [-s SEMENTE]
+                        [--host HOST] [--port PORTO | --unix CAMINHO]
+                        palavra1 [palavra2] ... [palavraN]
+
+Os clientes só precisam de um terminal e de algo que copie o que recebem
+do socket para o terminal:
+
+    $ nc localhost 8765
+    $ nc -U /tmp/efeitos.sock
+
+Cada cliente tem o seu próprio buffer com um número limitado de frames.
+Se um cliente não consegue acompanhar o ritmo do efeito, as frames mais
+antigas que ainda não lhe foram enviadas são descartadas. Deste modo, um
+cliente lento nunca atrasa os restantes. Isto só é possível porque cada
+frame redesenha por completo a linha ou o ecrã.
+
+O efeito é repetido indefinidamente, até o servidor ser interrompido
+com CTRL+C.
+
+As frames são geradas no próprio ciclo de eventos do asyncio. Enquanto
+uma frame está a ser gerada, nenhum cliente recebe dados. Com textos
+grandes no efeito 8 (matriz de len(texto) x len(texto) posições), isto
+pode atrasar todos os clientes.
+
+EXEMPLOS:
+    $ efeitos_server.py -e 6 -d 60 FRASCO AZUL
+    $ efeitos_server.py -e 8 --unix /tmp/efeitos.sock FRASCO
+
+--------------------------------------------------------------------------------
+
+(C) João Galamba, 2025
+Código sob licença MIT. Consultar: https://mit-license.org/
+"""
+
+import os
+import io
+import socket
+import asyncio
+import argparse
+from contextlib import redirect_stdout
+from typing import Callable, Iterator
+
+from console_utils import show_msg, format_msg, colors_requested
+from efeitos import (
+    DEFAULT_DELAY,
+    DEFAULT_LINE_LEN,
+    show_left_to_right_diagonal_effect,
+    show_right_to_left_diagonal_effect,
+    show_x_effect,
+    show_v_effect,
+    show_stair_effect,
+    slidding_frames,
+    uncover_line_frames,
+    uncover_matrix_frames,
+)
+
+
+DEFAULT_HOST = 'localhost'
+DEFAULT_PORT = 8765
+CLIENT_BUFFER_FRAMES = 4  # frames pendentes por cliente antes de descartar
+CLIENT_SEND_BUFFER = 8 * 1024   # em bytes, buffer do kernel por cliente
+REPEAT_PAUSE = 2.0        # em segundos, entre repetições do efeito
+
+CLEAR_SCREEN = '\x1b[2J\x1b[H'
+
+STATIC_EFFECTS: dict[str, Callable[[str], None]] = {
+    '1': show_left_to_right_diagonal_effect,
+    '2': show_right_to_left_diagonal_effect,
+    '3': show_x_effect,
+    '4': show_v_effect,
+    '5': show_stair_effect,
+}
+EFFECTS = (*STATIC_EFFECTS, '6', '7', '8')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description = 'Exibe um efeito de efeitos.py em vários terminais ligados por sockets',
+    )
+    parser.add_argument(
+        '-e', '--effect', '--efeito',
+        help = 'Efeito a exibir (ver menu de efeitos.py)',
+        choices = EFFECTS,
+        default = '6',
+        metavar = 'EFEITO',
+    )
+    parser.add_argument(
+        '-i',  '--delay', '--intervalo',
+        help = 'Intervalo de tempo entre frames',
+        type = float,
+        default = DEFAULT_DELAY,
+        metavar = 'INTERVALO',
+    )
+    parser.add_argument(
+        '-d', '--line-len', '--dimensao-linha',
+        help = 'Dimensão da linha em caracteres para efeito deslizante',
+        type = int,
+        default = DEFAULT_LINE_LEN,
+        metavar = 'DIMENSAO_LINHA',
+    )
+    parser.add_argument(
+        '-s', '--seed', '--semente',
+        help = 'Semente para os efeitos aleatórios (torna a execução reprodutível)',
+        type = int,
+        default = None,
+        metavar = 'SEMENTE',
+    )
+    parser.add_argument(
+        '--host',
+        help = 'Endereço onde o servidor TCP aguarda ligações',
+        default = DEFAULT_HOST,
+    )
+    address = parser.add_mutually_exclusive_group()
+    address.add_argument(
+        '-p', '--port', '--porto',
+        help = 'Porto TCP onde o servidor aguarda ligações',
+        type = int,
+        default = DEFAULT_PORT,
+        metavar = 'PORTO',
+    )
+    address.add_argument(
+        '-u', '--unix',
+        help = 'Caminho do socket Unix onde o servidor aguarda ligações',
+        metavar = 'CAMINHO',
+    )
+    parser.add_argument(
+        'text',
+        help = 'Palavras a listar',
+        metavar = 'PALAVRA',
+        nargs = '+',
+    )
+    args = parser.parse_args()
+
+    txt = ' '.join(args.text)
+    try:
+        asyncio.run(serve(
+            txt,
+            args.effect,
+            delay = args.delay,
+            line_len = args.line_len,
+            seed = args.seed,
+            host = args.host,
+            port = args.port,
+            unix_path = args.unix,
+        ))
+    except KeyboardInterrupt:
+        pass
+    show_msg("  O servidor vai encerrar!\n")
+#:
+
+class Broadcaster:
+    """
+    Sends each published frame to every connected client. Each client
+    has a bounded queue of pending frames. When that queue is full the
+    oldest pending frame is dropped, so a slow client skips frames
+    instead of stalling the others.
+
+    For this to work, the queue must be the only place where frames
+    pile up. So, a frame is only taken from the queue once the previous
+    one left the transport's buffer, and the kernel's send buffer for
+    the client's socket is kept small.
+    """
+    def __init__(self, buffer_frames = CLIENT_BUFFER_FRAMES):
+        self.buffer_frames = buffer_frames
+        self._clients: set[asyncio.Queue[bytes]] = set()
+        self._last_frame: bytes | None = None
+    #:
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+    #:
+
+    def publish(self, frame: bytes):
+        self._last_frame = frame
+        for queue in self._clients:
+            if queue.full():
+                queue.get_nowait()      # descarta a frame mais antiga
+            queue.put_nowait(frame)
+    #:
+
+    async def handle_client(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter,
+    ):
+        queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize = self.buffer_frames)
+        # drain() só retorna quando o buffer do transporte estiver vazio
+        writer.transport.set_write_buffer_limits(high = 0)
+        sock = writer.get_extra_info('socket')
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, CLIENT_SEND_BUFFER)
+            except OSError:
+                pass
+        if self._last_frame is not None:
+            # Quem chega a meio de um efeito vê logo a frame actual
+            queue.put_nowait(self._last_frame)
+        self._clients.add(queue)
+        show_msg(f"Cliente ligado ({self.client_count} ligados)")
+        try:
+            while True:
+                writer.write(await queue.get())
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self._clients.discard(queue)
+            show_msg(f"Cliente desligado ({self.client_count} ligados)")
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+    #:
+#:
+
+async def serve(
+        txt: str,
+        effect: str,
+        delay = DEFAULT_DELAY,
+        line_len = DEFAULT_LINE_LEN,
+        seed: int | None = None,
+        host = DEFAULT_HOST,
+        port = DEFAULT_PORT,
+        unix_path: str | None = None,
+):
+    broadcaster = Broadcaster()
+    if unix_path is not None:
+        server = await asyncio.start_unix_server(broadcaster.handle_client, unix_path)
+        show_msg(f"A aguardar ligações em {unix_path}")
+    else:
+        server = await asyncio.start_server(broadcaster.handle_client, host, port)
+        show_msg(f"A aguardar ligações em {host}:{port}")
+
+    color = colors_requested()
+    try:
+        async with server:
+            while True:
+                for frame in effect_frames(txt, effect, line_len, color, seed):
+                    broadcaster.publish(frame.encode())
+                    await asyncio.sleep(delay)
+                await asyncio.sleep(REPEAT_PAUSE)
+    finally:
+        if unix_path is not None and os.path.exists(unix_path):
+            os.remove(unix_path)
+#:
+
+def effect_frames(
+        txt: str,
+        effect: str,
+        line_len = DEFAULT_LINE_LEN,
+        color = True,
+        seed: int | None = None,
+) -> Iterator[str]:
+    """
+    Frames of `effect`, as complete strings ready to be sent to a
+    terminal. Each frame redraws the whole line or screen, so any frame
+    can be skipped without corrupting what the client sees.
+    """
+    if effect in STATIC_EFFECTS:
+        # uma única frame por repetição do efeito
+        yield CLEAR_SCREEN + _capture(STATIC_EFFECTS[effect], txt)
+        return
+
+    match effect:
+        case '6':
+            for line in slidding_frames(txt, line_len, color):
+                yield f'{format_msg(line)}\r'
+        case '7':
+            for line in uncover_line_frames(txt, color, seed):
+                yield f'{format_msg(line)}\r'
+        case '8':
+            for lines in uncover_matrix_frames(txt, color, seed):
+                yield CLEAR_SCREEN + ''.join(f'{format_msg(line)}\n' for line in lines)
+        case _:
+            raise ValueError(f'Invalid effect: {effect}')
+#:
+
+def _capture(fn: Callable, *args, **kargs) -> str:
+    """
+    Return what `fn` writes to stdout, instead of writing it. Only used
+    for the static effects, which are written once per repetition.
+    """
+    out = io.StringIO()
+    with redirect_stdout(out):
+        fn(*args, **kargs)
+    return out.getvalue()
+#:
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,9 @@ Generic utilities for this project.
 Código sob licença MIT. Consultar: https://mit-license.org/
 """
 
+import os
+import mmap
+import random
 from typing import (
     Any,
     Iterator,
@@ -21,6 +24,8 @@ __all__ = (
     'renumerate',
     'SizedReversible',
     'IndexedSizedReversible',
+    'MappedTextFile',
+    'random_permutation',
 )
 
 @runtime_checkable
@@ -87,4 +92,195 @@ def renumerate(
 #     start_at = start_at if start_at is not None else len(collection) - 1
 #     return zip(range(start_at, end_at, -1), reversed(collection))
 
+DEFAULT_CHUNK_SIZE = 64 * 1024    # em bytes
 
+
+class MappedTextFile:
+    """
+    UTF-8 text file that is read through a memory map, one chunk at a
+    time, either from the start or from the end. Only a chunk of text
+    is decoded at any given moment, so files far larger than the
+    available RAM can be walked in both directions with constant memory.
+
+    Instances are sized and reversible (see `SizedReversible`), so they
+    can be passed to `renumerate`, `reversed`, `zip`, etc., just like a
+    `str`. Words (whitespace-separated) can be obtained from the end
+    with `reversed_words`.
+
+    Chunks never split a UTF-8 encoded character: a chunk boundary that
+    falls inside a multi-byte sequence is moved to the start of that
+    sequence.
+
+    Examples:
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(
+        ...         'w', encoding = 'utf-8', delete = False
+        ... ) as file:
+        ...     _ = file.write('Olá mundo')
+        >>> txt = MappedTextFile(file.name)
+        >>> len(txt)
+        9
+        >>> ''.join(reversed(txt))
+        'odnum álO'
+        >>> list(txt.reversed_words())
+        ['mundo', 'Olá']
+
+        With 4-byte chunks, characters and words span several chunks:
+        >>> txt = MappedTextFile(file.name, chunk_size = 4)
+        >>> ''.join(reversed(txt)), ''.join(txt)
+        ('odnum álO', 'Olá mundo')
+        >>> list(txt.reversed_words())
+        ['mundo', 'Olá']
+        >>> with open(file.name, 'w', encoding = 'utf-8') as f:
+        ...     _ = f.write('€uro çççç  ñ😀ñ ab')
+        >>> txt = MappedTextFile(file.name, chunk_size = 4)
+        >>> len(txt)
+        17
+        >>> list(txt.reversed_words())
+        ['ab', 'ñ😀ñ', 'çççç', '€uro']
+        >>> os.remove(file.name)
+    """
+    def __init__(self, path: str, chunk_size = DEFAULT_CHUNK_SIZE):
+        if chunk_size < 4:
+            # a chunk must be able to hold any UTF-8 encoded character
+            raise ValueError(f'Chunk size too small: {chunk_size}')
+        self.path = path
+        self.chunk_size = chunk_size
+        self._len: int | None = None
+    #:
+
+    def __len__(self) -> int:
+        if self._len is None:
+            self._len = sum(len(chunk) for chunk in self._chunks())
+        return self._len
+    #:
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self._chunks():
+            yield from chunk
+    #:
+
+    def __reversed__(self) -> Iterator[str]:
+        for chunk in self._chunks(reverse = True):
+            yield from reversed(chunk)
+    #:
+
+    def reversed_words(self) -> Iterator[str]:
+        """
+        Whitespace-separated words, from the last one to the first. 
+        Same as `reversed(text.split())`, but without loading the whole
+        text. Memory use is bounded by the chunk size plus the length
+        of the longest word, which must be yielded as a single `str`.
+        """
+        # Pieces of a word that spans several chunks, last piece first.
+        # They are only joined once the start of the word is found.
+        pieces: list[str] = []
+        for chunk in self._chunks(reverse = True):
+            words = chunk.split()
+            if not chunk[-1].isspace():
+                pieces.append(words.pop())
+            elif pieces:
+                yield ''.join(reversed(pieces))
+                pieces = []
+            if pieces and (words or chunk[0].isspace()):
+                # there's whitespace before the last piece
+                yield ''.join(reversed(pieces))
+                pieces = []
+            if words and not chunk[0].isspace():
+                pieces = [words.pop(0)]
+            yield from reversed(words)
+        if pieces:
+            yield ''.join(reversed(pieces))
+    #:
+
+    def _chunks(self, reverse = False) -> Iterator[str]:
+        with open(self.path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return      # mmap can't map empty files
+            with mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ) as mm:
+                size = len(mm)
+                if reverse:
+                    end = size
+                    while end > 0:
+                        start = max(end - self.chunk_size, 0)
+                        limit = min(start + _MAX_UTF8_CONTINUATIONS, end - 1)
+                        while 0 < start < limit and _is_utf8_continuation(mm[start]):
+                            start += 1
+                        yield mm[start:end].decode('utf-8')
+                        end = start
+                else:
+                    start = 0
+                    while start < size:
+                        end = min(start + self.chunk_size, size)
+                        limit = max(end - _MAX_UTF8_CONTINUATIONS, start + 1)
+                        while limit < end < size and _is_utf8_continuation(mm[end]):
+                            end -= 1
+                        yield mm[start:end].decode('utf-8')
+                        start = end
+    #:
+#:
+
+# A UTF-8 encoded character has, at most, 3 continuation bytes. If a
+# chunk boundary is still on a continuation byte after moving it this
+# much, the file isn't valid UTF-8 and decode() will complain.
+_MAX_UTF8_CONTINUATIONS = 3
+
+
+def _is_utf8_continuation(byte: int) -> bool:
+    return byte & 0b1100_0000 == 0b1000_0000
+#:
+
+_FEISTEL_ROUNDS = 4
+_MASK64 = (1 << 64) - 1
+
+
+def random_permutation(n: int, seed: int | None = None) -> Iterator[int]:
+    """
+    Yield every integer in `range(n)` exactly once, in a pseudo-random
+    order, without building (and shuffling) a list with all of them.
+    Memory use is constant, no matter how large `n` is. The same `seed`
+    always produces the same order; with `seed = None` the order is
+    different in every call.
+
+    Works by encrypting 0, 1, 2, ... with a small Feistel network over
+    the smallest power of 4 >= n. Results that fall outside `range(n)`
+    are encrypted again until they fall inside ("cycle walking"), which
+    keeps the mapping a permutation of `range(n)`. Since the Feistel
+    domain is less than 4 * n, each index takes, on average, fewer than
+    four encryptions.
+
+    Examples:
+        >>> sorted(random_permutation(10)) == list(range(10))
+        True
+        >>> list(random_permutation(5, seed = 7)) == list(random_permutation(5, seed = 7))
+        True
+    """
+    if n < 0:
+        raise ValueError(f'Negative permutation size: {n}')
+    half_bits = max(1, ((n - 1).bit_length() + 1) // 2)
+    rng = random.Random(seed)
+    keys = [rng.getrandbits(64) for _ in range(_FEISTEL_ROUNDS)]
+    for i in range(n):
+        x = _feistel(i, half_bits, keys)
+        while x >= n:
+            x = _feistel(x, half_bits, keys)
+        yield x
+#:
+
+def _feistel(x: int, half_bits: int, keys: list[int]) -> int:
+    mask = (1 << half_bits) - 1
+    left, right = x >> half_bits, x & mask
+    for key in keys:
+        left, right = right, left ^ _feistel_round(right, key, half_bits)
+    return (left << half_bits) | right
+#:
+
+def _feistel_round(half: int, key: int, half_bits: int) -> int:
+    # splitmix64-like mixing; the top bits depend on all bits of `half`,
+    # so those are the ones we return
+    x = ((half ^ key) * 0x9E3779B97F4A7C15) & _MASK64
+    x ^= x >> 31
+    x = (x * 0xBF58476D1CE4E5B9) & _MASK64
+    x ^= x >> 29
+    return x >> (64 - half_bits)
+#: